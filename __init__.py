@@ -84,7 +84,7 @@ else:
         ops_utils,
         ops_weighting,
     )
-    from .lib import on_load
+    from .lib import mesh, on_load
 
 
 classes = (
@@ -208,6 +208,7 @@ def register():
     preferences.upd_asset_popover_width(prefs, None)
 
     on_load.handler_add()
+    mesh.handler_add()
 
     # mod_update
     # ---------------------------
@@ -245,6 +246,7 @@ def unregister():
 
     spacing_overlay.handler_del()
     on_load.handler_del()
+    mesh.handler_del()
 
     # Translations
     # ---------------------------
@@ -259,6 +261,7 @@ def unregister():
 
     var.preview_collections.clear()
     dynamic_list._cache.clear()
+    mesh._cache.clear()
     preferences._folder_cache.clear()
 
 
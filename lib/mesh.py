@@ -20,126 +20,320 @@
 
 
 from typing import List, Iterable, Tuple
+from collections import OrderedDict
 
 import bpy
 from bpy.types import Object
-import bmesh
+from bpy.app.handlers import persistent
 from bmesh.types import BMesh, BMVert, BMEdge, BMFace
 from mathutils import Matrix
+import numpy as np
 
 from .iterutils import pairwise_cyclic, quadwise_cyclic
 
+_cache = OrderedDict()
+_CACHE_SIZE = 128
 
-def est_volume(obs: Iterable[Object]) -> float:
-    depsgraph = bpy.context.evaluated_depsgraph_get()
-    bm = bmesh.new()
+
+def handler_add():
+    bpy.app.handlers.depsgraph_update_post.append(_cache_flush)
+    bpy.app.handlers.load_pre.append(_cache_clear)
+
+
+def handler_del():
+    bpy.app.handlers.depsgraph_update_post.remove(_cache_flush)
+    bpy.app.handlers.load_pre.remove(_cache_clear)
+
+
+@persistent
+def _cache_clear(dummy):
+    _cache.clear()
+
+
+@persistent
+def _cache_flush(scene, depsgraph):
+    if not _cache:
+        return
+
+    updated = {upd.id.original.as_pointer() for upd in depsgraph.updates}
+
+    for key in tuple(_cache):
+        for entry in key[1:]:
+            if entry[0] in updated or entry[1] in updated:
+                del _cache[key]
+                break
+
+
+def _cache_key(ob: Object) -> tuple:
+    return (
+        ob.as_pointer(),
+        ob.data.as_pointer(),
+        tuple((m.name, m.show_viewport) for m in ob.modifiers),
+        tuple(round(x, 6) for row in ob.matrix_world for x in row),
+    )
+
+
+def _cache_store(key: tuple, value: float) -> float:
+    _cache[key] = value
+
+    if len(_cache) > _CACHE_SIZE:
+        _cache.popitem(last=False)
+
+    return value
+
+
+def est_volume(obs: Iterable[Object], depsgraph=None) -> float:
+    obs = tuple(obs)
+    key = ("volume", *map(_cache_key, obs))
+    hit = _cache.get(key)
+
+    if hit is not None:
+        _cache.move_to_end(key)
+        return hit
+
+    if depsgraph is None:
+        depsgraph = bpy.context.evaluated_depsgraph_get()
+
+    vol = 0.0
 
     for ob in obs:
-        ob_eval = ob.evaluated_get(depsgraph)
-        me = ob_eval.to_mesh()
-        me.transform(ob.matrix_world)
+        if ob.type == "MESH" and not ob.modifiers and ob.data.shape_keys is None and not ob.data.is_editmode:
+            ob_eval = None
+            me = ob.data
+        else:
+            ob_eval = ob.evaluated_get(depsgraph)
+            me = ob_eval.to_mesh()
 
-        bm.from_mesh(me)
+        me.calc_loop_triangles()
 
-        ob_eval.to_mesh_clear()
+        co = np.empty(len(me.vertices) * 3, dtype="f4")
+        me.vertices.foreach_get("co", co)
+        co.shape = (-1, 3)
+
+        tris = np.empty(len(me.loop_triangles) * 3, dtype="i4")
+        me.loop_triangles.foreach_get("vertices", tris)
+        tris.shape = (-1, 3)
+
+        if ob_eval is not None:
+            ob_eval.to_mesh_clear()
+
+        mat = np.array(ob.matrix_world, dtype="f8")
+        co = co @ mat[:3, :3].T + mat[:3, 3]
+
+        # Divergence theorem, V = 1/6 ∑ u ∙ (v × w)
+        # Triple product expanded by component, skips np.cross overhead
+        u = co[tris[:, 0]]
+        v = co[tris[:, 1]]
+        w = co[tris[:, 2]]
 
-    bmesh.ops.triangulate(bm, faces=bm.faces, quad_method="SHORT_EDGE")
+        vol += (
+            u[:, 0] * (v[:, 1] * w[:, 2] - v[:, 2] * w[:, 1]) +
+            u[:, 1] * (v[:, 2] * w[:, 0] - v[:, 0] * w[:, 2]) +
+            u[:, 2] * (v[:, 0] * w[:, 1] - v[:, 1] * w[:, 0])
+        ).sum() / 6.0
 
-    vol = bm.calc_volume()
-    bm.free()
+    return _cache_store(key, abs(vol))
 
-    return vol
+
+def _edge_length_eval(ob: Object) -> float:
+    depsgraph = bpy.context.evaluated_depsgraph_get()
+    ob_eval = ob.evaluated_get(depsgraph)
+    me = ob_eval.to_mesh()
+
+    co = np.empty(len(me.vertices) * 3, dtype="f4")
+    me.vertices.foreach_get("co", co)
+    co.shape = (-1, 3)
+
+    edges = np.empty(len(me.edges) * 2, dtype="i4")
+    me.edges.foreach_get("vertices", edges)
+    edges.shape = (-1, 2)
+
+    ob_eval.to_mesh_clear()
+
+    # Translation cancels out in segment differences
+    mat = np.array(ob.matrix_world, dtype="f8")
+    co = co @ mat[:3, :3].T
+
+    return float(np.linalg.norm(co[edges[:, 1]] - co[edges[:, 0]], axis=1).sum())
 
 
 def est_curve_length(ob: Object) -> float:
-    if ob.modifiers:
+    key = ("length", _cache_key(ob))
+    hit = _cache.get(key)
 
-        # Reset curve
-        # ---------------------------
+    if hit is not None:
+        _cache.move_to_end(key)
+        return hit
 
-        settings = {
-            "bevel_object": None,
-            "bevel_depth": 0.0,
-            "extrude": 0.0,
-        }
+    if ob.modifiers:
 
-        for k, v in settings.items():
-            x = getattr(ob.data, k)
-            setattr(ob.data, k, v)
-            settings[k] = x
+        if ob.mode == "EDIT":
 
-        # Calculate length
-        # ---------------------------
+            # Cannot swap data on an edit-mode object,
+            # reset settings in place
+            # ---------------------------
 
-        depsgraph = bpy.context.evaluated_depsgraph_get()
-        ob_eval = ob.evaluated_get(depsgraph)
-        me = ob_eval.to_mesh()
-        me.transform(ob.matrix_world)
+            settings = {
+                "bevel_object": None,
+                "bevel_depth": 0.0,
+                "extrude": 0.0,
+            }
 
-        bm = bmesh.new()
-        bm.from_mesh(me)
+            for k, v in settings.items():
+                x = getattr(ob.data, k)
+                setattr(ob.data, k, v)
+                settings[k] = x
 
-        ob_eval.to_mesh_clear()
+            try:
+                length = _edge_length_eval(ob)
+            finally:
+                for k, v in settings.items():
+                    setattr(ob.data, k, v)
 
-        length = 0.0
+        else:
 
-        for edge in bm.edges:
-            length += edge.calc_length()
+            # Reset curve on a temporary copy
+            # ---------------------------
 
-        bm.free()
+            curve_orig = ob.data
+            curve = curve_orig.copy()
+            curve.bevel_object = None
+            curve.bevel_depth = 0.0
+            curve.extrude = 0.0
+            ob.data = curve
 
-        # Restore curve
-        # ---------------------------
+            try:
+                length = _edge_length_eval(ob)
+            finally:
+                ob.data = curve_orig
+                bpy.data.curves.remove(curve)
 
-        for k, v in settings.items():
-            setattr(ob.data, k, v)
+        # Own restore writes dirty the depsgraph and would evict
+        # the entry at once, caching it is futile
+        return length
 
     else:
 
-        curve = ob.data.copy()
-        curve.transform(ob.matrix_world)
-
         length = 0.0
 
-        for spline in curve.splines:
-            length += spline.calc_length()
+        if all(spline.type == "POLY" for spline in ob.data.splines):
+            # Translation cancels out in segment differences
+            mat = np.array(ob.matrix_world, dtype="f8")
 
-        bpy.data.curves.remove(curve)
+            for spline in ob.data.splines:
+                co = np.empty(len(spline.points) * 4, dtype="f4")
+                spline.points.foreach_get("co", co)
+                co = co.reshape(-1, 4)[:, :3] @ mat[:3, :3].T
 
-    return length
+                if spline.use_cyclic_u:
+                    co = np.vstack((co, co[:1]))
+
+                length += float(np.linalg.norm(np.diff(co, axis=0), axis=1).sum())
+
+        else:
+
+            curve = ob.data.copy()
+            curve.transform(ob.matrix_world)
+
+            for spline in curve.splines:
+                length += spline.calc_length()
+
+            bpy.data.curves.remove(curve)
+
+    return _cache_store(key, length)
 
 
 def connect_verts(bm: BMesh, verts: Iterable[BMVert]) -> List[BMEdge]:
-    return [bm.edges.new(x) for x in pairwise_cyclic(verts)]
+    return list(map(bm.edges.new, pairwise_cyclic(verts)))
 
 
 def bridge_verts(bm: BMesh, v1: Iterable[BMVert], v2: Iterable[BMVert]) -> Tuple[List[BMEdge], List[BMFace]]:
-    faces = [bm.faces.new(x) for x in quadwise_cyclic(v1, v2)]
-    edges = [f.edges[1] for f in faces]
+    new_face = bm.faces.new
+    get_edge = bm.edges.get
+    edges = []
+    faces = []
+
+    for quad in quadwise_cyclic(v1, v2):
+        faces.append(new_face(quad))
+        edges.append(get_edge(quad[1:3]))
 
     return edges, faces
 
 
 def face_pos() -> List[Matrix]:
-    depsgraph = bpy.context.evaluated_depsgraph_get()
-    mats = []
-
     for ob in bpy.context.objects_in_mode:
         ob.update_from_editmode()
-        depsgraph.update()
 
+    depsgraph = bpy.context.evaluated_depsgraph_get()
+    ob_centers = []
+    ob_normals = []
+
+    for ob in bpy.context.objects_in_mode:
         ob_eval = ob.evaluated_get(depsgraph)
         me = ob_eval.to_mesh()
-        me.transform(ob.matrix_world)
 
-        for poly in me.polygons:
-            if poly.select:
-                mat_loc = Matrix.Translation(poly.center)
-                mat_rot = poly.normal.to_track_quat("Z", "Y").to_matrix().to_4x4()
-                mat = mat_loc @ mat_rot
+        select = np.empty(len(me.polygons), dtype="?")
+        me.polygons.foreach_get("select", select)
+
+        if not select.any():
+            ob_eval.to_mesh_clear()
+            continue
+
+        centers = np.empty(len(me.polygons) * 3, dtype="f4")
+        me.polygons.foreach_get("center", centers)
+        centers.shape = (-1, 3)
+        centers = centers[select]
 
-                mats.append(mat)
+        normals = np.empty(len(me.polygons) * 3, dtype="f4")
+        me.polygons.foreach_get("normal", normals)
+        normals.shape = (-1, 3)
+        normals = normals[select]
 
         ob_eval.to_mesh_clear()
 
-    return mats
+        mat = np.array(ob.matrix_world, dtype="f8")
+        ob_centers.append(centers @ mat[:3, :3].T + mat[:3, 3])
+        # Cofactor matrix: inverse transpose up to scale,
+        # stays defined when the object matrix is singular
+        cof = np.cross(mat[[1, 2, 0], :3], mat[[2, 0, 1], :3])
+        ob_normals.append(normals @ cof.T)
+
+    if not ob_centers:
+        return []
+
+    centers = np.concatenate(ob_centers)
+
+    # Match normal.to_track_quat("Z", "Y"): local Y aims at the
+    # projection of world +Z onto the face plane
+    z = np.concatenate(ob_normals)
+    z_len = np.linalg.norm(z, axis=1, keepdims=True)
+    degenerate = z_len[:, 0] < 1e-8
+    z /= np.maximum(z_len, 1e-8)
+
+    y = z * -z[:, 2:3]
+    y[:, 2] += 1.0
+    y /= np.maximum(np.linalg.norm(y, axis=1, keepdims=True), 1e-8)
+    x = np.cross(y, z)
+
+    # vec_to_quat fallback for normals along the Z axis
+    vertical = np.abs(z[:, 0]) + np.abs(z[:, 1]) < 1e-4
+
+    if vertical.any():
+        x[vertical] = (-1.0, 0.0, 0.0)
+        y[vertical] = 0.0
+        y[vertical, 1] = np.where(z[vertical, 2] > 0.0, -1.0, 1.0)
+
+    # Identity for degenerate faces with a zero-length normal
+    if degenerate.any():
+        x[degenerate] = (1.0, 0.0, 0.0)
+        y[degenerate] = (0.0, 1.0, 0.0)
+        z[degenerate] = (0.0, 0.0, 1.0)
+
+    m = np.zeros((len(z), 4, 4))
+    m[:, :3, 0] = x
+    m[:, :3, 1] = y
+    m[:, :3, 2] = z
+    m[:, :3, 3] = centers
+    m[:, 3, 3] = 1.0
+
+    return [Matrix(v) for v in m]
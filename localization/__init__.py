@@ -22,6 +22,7 @@
 import os
 import re
 import json
+from sys import intern
 from typing import Dict, Tuple, Iterator
 
 
@@ -30,7 +31,7 @@ Translation = Dict[Tuple[str, str], str]
 
 def _convert(d: Dict[str, Dict[str, str]]) -> Translation:
     return {
-        (ctxt, msg_key): msg_translation
+        (intern(ctxt), intern(msg_key)): msg_translation
         for ctxt, msgs in d.items()
         for msg_key, msg_translation in msgs.items()
     }
@@ -27,16 +27,17 @@ from bmesh.types import BMesh, BMVert
 from ...lib import mesh
 
 
+_RECT_TEMPLATE = (
+    ( 1.0,  1.0),
+    (-1.0,  1.0),
+    (-1.0, -1.0),
+    ( 1.0, -1.0),
+)
+
+
 def _add_rect(bm: BMesh, x: float, y: float, z: float) -> List[BMVert]:
-    return [
-        bm.verts.new(co)
-        for co in (
-            ( x,  y, z),
-            (-x,  y, z),
-            (-x, -y, z),
-            ( x, -y, z),
-        )
-    ]
+    new = bm.verts.new
+    return [new((a * x, b * y, z)) for a, b in _RECT_TEMPLATE]
 
 
 def _add_rect_bevel(
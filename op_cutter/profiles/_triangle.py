@@ -27,15 +27,16 @@ from bmesh.types import BMesh, BMVert
 from ...lib import mesh
 
 
+_TRI_TEMPLATE = (
+    ( 1.0,  1.0 / 3.0),
+    (-1.0,  1.0 / 3.0),
+    ( 0.0, -1.0 / 1.5),
+)
+
+
 def _add_tri(bm: BMesh, x: float, y: float, z: float) -> List[BMVert]:
-    return [
-        bm.verts.new(co)
-        for co in (
-            (  x,  y / 3.0, z),
-            ( -x,  y / 3.0, z),
-            (0.0, -y / 1.5, z),
-        )
-    ]
+    new = bm.verts.new
+    return [new((a * x, b * y, z)) for a, b in _TRI_TEMPLATE]
 
 
 def _add_tri_bevel(
@@ -99,10 +100,9 @@ def _edge_loop_walk(verts: Iterable[BMVert]) -> Iterator[BMVert]:
         yield ov
         v = ov
 
-        for oe in ov.link_edges:
-            if oe != e:
-                e = oe
-                break
+        # Boundary loop, every vert links exactly two edges
+        e0, e1 = v.link_edges
+        e = e1 if e0 is e else e0
 
         ov = e.other_vert(v)
 
@@ -63,7 +63,7 @@ def data_collect(gem_map: bool = False, show_warnings: bool = True) -> _Data:
                 if item.object.type == "MESH":
                     name = item.material_name
                     density = unit.convert_cm3_mm3(item.material_density)
-                    vol = Scale.from_scene_vol(mesh.est_volume((item.object,)))
+                    vol = Scale.from_scene_vol(mesh.est_volume((item.object,), depsgraph))
                     Report.materials[(name, density)] += vol
 
             elif item.type == "DIMENSIONS":